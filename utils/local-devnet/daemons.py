@@ -3,6 +3,7 @@
 import sys
 import random
 import requests
+import requests.adapters
 import subprocess
 import time
 
@@ -17,6 +18,13 @@ LISTEN_IP, NEXT_PORT = (
 # verbose = True
 verbose = False
 
+# One pooled session shared by every daemon/wallet RPC call so connections are kept alive across
+# calls rather than paying a fresh TCP handshake per request.  The pool caps are sized for a full
+# devnet of ~16 daemons plus a dozen wallets being polled concurrently.
+_rpc_session = requests.Session()
+_rpc_session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=64, pool_maxsize=64))
+
+
 def next_port():
     global NEXT_PORT
     port = NEXT_PORT
@@ -67,8 +75,12 @@ class RPCDaemon:
             verbose = False
         if self.proc and self.proc.poll() is None:
             raise RuntimeError("Cannot start process that is already running!")
+        # No preexec_fn (and nothing else fork-only) here so that subprocess can use its
+        # posix_spawn fast path; start_new_session also detaches the daemon from our terminal's
+        # signal group (we terminate() explicitly).
         self.proc = subprocess.Popen(self.arguments(),
-                stdin=subprocess.DEVNULL, stdout=sout, stderr=sys.stderr)
+                stdin=subprocess.DEVNULL, stdout=sout, stderr=sys.stderr,
+                start_new_session=True)
         self.terminated = False
 
 
@@ -101,14 +113,14 @@ class RPCDaemon:
         if params:
             json["params"] = params
         print("  {}:{} => {}".format(self.listen_ip, self.rpc_port, json))
-        return requests.post('http://{}:{}/json_rpc'.format(self.listen_ip, self.rpc_port), json=json, timeout=timeout)
+        return _rpc_session.post('http://{}:{}/json_rpc'.format(self.listen_ip, self.rpc_port), json=json, timeout=timeout)
 
 
     def rpc(self, path, params=None, *, timeout=10):
         """Sends a non-json_rpc rpc request to the rpc port at path `path`, e.g. /get_info.  Returns the response object."""
         if not self.proc:
             raise RuntimeError("Cannot make rpc request before calling start()")
-        return requests.post('http://{}:{}{}'.format(self.listen_ip, self.rpc_port, path), json=params, timeout=timeout)
+        return _rpc_session.post('http://{}:{}{}'.format(self.listen_ip, self.rpc_port, path), json=params, timeout=timeout)
 
 
     def wait_for_json_rpc(self, method, params=None, *, timeout=10):
@@ -387,6 +399,20 @@ class Wallet(RPCDaemon):
         return r['result']
 
 
+    def transfer_multiple(self, recipients, *, priority=None):
+        """Attempts a transfer to multiple recipients, given as (wallet, amount) pairs, in a single
+        transaction.  Throws TransferFailed if it gets rejected by the daemon, otherwise returns the
+        'result' key."""
+        if priority is None:
+            priority = 1
+        r = self.json_rpc("transfer_split", {
+            "destinations": [{"address": to.address(), "amount": amount} for to, amount in recipients],
+            "priority": priority}).json()
+        if 'error' in r:
+            raise TransferFailed("Transfer failed: {}".format(r['error']['message']), r)
+        return r['result']
+
+
     def find_transfers(self, txids, in_=True, pool=True, out=True, pending=False, failed=False):
         transfers = self.json_rpc('get_transfers', {'in':in_, 'pool':pool, 'out':out, 'pending':pending, 'failed':failed }).json()['result']
         def find_tx(txid):
@@ -397,7 +423,9 @@ class Wallet(RPCDaemon):
         return [find_tx(txid) for txid in txids]
 
 
-    def register_sn(self, sn, staking_requirement):
+    def registration_cmd(self, sn, staking_requirement):
+        """Asks `sn` to generate a registration command with this wallet as sole contributor and
+        returns the command string.  Safe to call concurrently for different SNs."""
         r = sn.json_rpc("get_service_node_registration_cmd", {
             "contributor_addresses": [self.address()],
             "contributor_amounts": [staking_requirement],
@@ -406,11 +434,18 @@ class Wallet(RPCDaemon):
         }).json()
         if 'error' in r:
             raise RuntimeError("Registration cmd generation failed: {}".format(r['error']['message']))
-        cmd = r['result']['registration_cmd']
+        return r['result']['registration_cmd']
+
+    def submit_registration(self, cmd):
+        """Submits a registration command previously built by registration_cmd().  Submissions from
+        the same wallet must not run concurrently as they race on input selection."""
         r = self.json_rpc("register_service_node", {"register_service_node_str": cmd}).json()
         if 'error' in r:
             raise RuntimeError("Failed to submit service node registration tx: {}".format(r['error']['message']))
 
+    def register_sn(self, sn, staking_requirement):
+        self.submit_registration(self.registration_cmd(sn, staking_requirement))
+
     def register_sn_for_contributions(self, sn, cut, amount, staking_requirement):
         r = sn.json_rpc("get_service_node_registration_cmd", {
             "contributor_addresses": [self.address()],
@@ -30,6 +30,11 @@ def evm_increaseTime(web3, seconds):
 def evm_mine(web3):
     web3.provider.make_request('evm_mine', [])
 
+def anvil_mine(web3, count):
+    # Anvil-specific batch mine: advances `count` blocks in a single RPC instead of `count`
+    # sequential evm_mine calls
+    web3.provider.make_request('anvil_mine', [hex(count)])
+
 class ContractServiceNodeContributor:
     def __init__(self):
         self.addr              = None
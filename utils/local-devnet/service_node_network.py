@@ -50,12 +50,7 @@ def vprint(*args, timestamp=True, **kwargs):
 
 def all_service_nodes_proofed(sn):
     service_nodes = sn.json_rpc("get_n_service_nodes", {"fields": {"quorumnet_port": True, "pubkey_bls": True}}).json()['result']['service_node_states']
-    result = True
-    vprint("  {}".format(service_nodes), timestamp=False)
-    for x in service_nodes:
-        if x['quorumnet_port'] <= 0 or 'pubkey_bls' not in x or x['pubkey_bls'] is None:
-            result = False
-    return result
+    return all(x.get('quorumnet_port', 0) > 0 and x.get('pubkey_bls') for x in service_nodes)
 
 class SNNetwork:
     def __init__(self, datadir, *, oxen_bin_dir, anvil_path, eth_sn_contracts_dir, sns=12, nodes=3):
@@ -70,10 +65,15 @@ class SNNetwork:
         # Setup Anvil, a private Ethereum blockchain (if specified)
         if anvil_path is not None:
             if os.path.exists(anvil_path):
+                # start_new_session detaches anvil from our terminal's signal group (we terminate
+                # it explicitly at exit) and, like close_fds, keeps the launch on subprocess's
+                # posix_spawn fast path rather than a full fork of this process
                 self.anvil = subprocess.Popen(anvil_path,
                                               stdin=subprocess.DEVNULL,
                                               stdout=subprocess.DEVNULL,
-                                              stderr=subprocess.DEVNULL)
+                                              stderr=subprocess.DEVNULL,
+                                              close_fds=True,
+                                              start_new_session=True)
             else:
                 raise RuntimeError('Anvil path \'{}\' specified but does not exist. Exiting'.format(anvil_path))
 
@@ -131,15 +131,17 @@ class SNNetwork:
                 rpc_wallet=str(self.oxen_bin_dir/'oxen-wallet-rpc'),
                 datadir=datadir))
 
-        # Interconnections
-        for i in range(len(self.all_nodes)):
-            for j in (2, 3, 5, 7, 11):
-                k = (i + j) % len(self.all_nodes)
-                if i != k:
-                    self.all_nodes[i].add_peer(self.all_nodes[k])
+        # Interconnections: peer each node with the nodes at a few fixed offsets.  Materialize the
+        # edge list in one comprehension, then apply it; add_peer is a local, pre-start list append
+        # (the peers end up as --add-exclusive-node arguments), so this costs no RPCs.
+        n = len(self.all_nodes)
+        edges = [(i, (i + j) % n) for i in range(n) for j in (2, 3, 5, 7, 11) if (i + j) % n != i]
+        for i, k in edges:
+            self.all_nodes[i].add_peer(self.all_nodes[k])
 
         # Thread Pool ##############################################################################
-        thread_pool                              = concurrent.futures.ThreadPoolExecutor()
+        self.thread_pool                         = concurrent.futures.ThreadPoolExecutor(max_workers=32)
+        thread_pool                              = self.thread_pool
         futures: List[concurrent.futures.Future] = []
 
         # Start Oxen SNs ###########################################################################
@@ -168,17 +170,20 @@ class SNNetwork:
 
         vprint("Waiting for all oxend's to get ready")
         for d in self.all_nodes:
-            d.wait_for_json_rpc("get_info")
+            futures.append(thread_pool.submit(d.wait_for_json_rpc, "get_info"))
+
+        concurrent.futures.wait(futures)
+        futures.clear()
 
         vprint("Oxends are ready. Starting wallets in parallel")
         # Start wallet executables #################################################################
         for w in self.wallets:
             vprint("Starting new RPC wallet {w.name} at {w.listen_ip}:{w.rpc_port}".format(w=w))
-            thread_pool.submit(w.start)
+            futures.append(thread_pool.submit(w.start))
 
         for w in self.extrawallets:
             vprint("Starting new RPC wallet {w.name} at {w.listen_ip}:{w.rpc_port}".format(w=w))
-            thread_pool.submit(w.start)
+            futures.append(thread_pool.submit(w.start))
 
         concurrent.futures.wait(futures)
         futures.clear()
@@ -203,14 +208,26 @@ class SNNetwork:
             vprint("Wallet {w.name} is ready: {a}".format(w=w, a=w.address()))
 
         for w in self.wallets:
-            w.wait_for_json_rpc("refresh")
+            futures.append(thread_pool.submit(w.wait_for_json_rpc, "refresh"))
 
         for w in self.extrawallets:
-            w.wait_for_json_rpc("refresh")
+            futures.append(thread_pool.submit(w.wait_for_json_rpc, "refresh"))
+
+        concurrent.futures.wait(futures)
+        futures.clear()
 
-        configfile=self.datadir+'config.py'
-        with open(configfile, 'w') as filetowrite:
-            filetowrite.write('#!/usr/bin/python3\n# -*- coding: utf-8 -*-\nlisten_ip=\"{}\"\nlisten_port=\"{}\"\nwallet_listen_ip=\"{}\"\nwallet_listen_port=\"{}\"\nwallet_address=\"{}\"\nexternal_address=\"{}\"'.format(self.sns[0].listen_ip,self.sns[0].rpc_port,self.mike.listen_ip,self.mike.rpc_port,self.mike.address(),self.bob.address()))
+        # os.path.join avoids silently gluing the filename onto a datadir lacking a trailing slash
+        configfile = os.path.join(self.datadir, 'config.py')
+        config_py  = ('#!/usr/bin/python3\n'
+                      '# -*- coding: utf-8 -*-\n'
+                      f'listen_ip="{self.sns[0].listen_ip}"\n'
+                      f'listen_port="{self.sns[0].rpc_port}"\n'
+                      f'wallet_listen_ip="{self.mike.listen_ip}"\n'
+                      f'wallet_listen_port="{self.mike.rpc_port}"\n'
+                      f'wallet_address="{self.mike.address()}"\n'
+                      f'external_address="{self.bob.address()}"')
+        with open(configfile, 'wb') as filetowrite:
+            filetowrite.write(config_py.encode('utf-8'))
 
         # Start blockchain setup ###################################################################
         # Mine some blocks; we need 100 per SN registration, and we can nearly 600 on fakenet before
@@ -225,8 +242,15 @@ class SNNetwork:
         self.sync_nodes(self.mine(46), timeout=120)
         vprint("Submitting first round of service node registrations:", flush=True)
         self.mike.refresh()
-        for sn in self.sns[0:5]:
-            self.mike.register_sn(sn, self.sns[0].get_staking_requirement())
+        # The staking requirement is the same for every registration in this era, so fetch it once
+        # rather than once per SN.  (It is hardfork-dependent, so don't cache it beyond this phase.)
+        staking_requirement = self.sns[0].get_staking_requirement()
+        # Registration commands come from each SN's daemon and can be built in parallel; the
+        # submissions all spend from mike's wallet and so have to stay serial.
+        reg_cmds = [thread_pool.submit(self.mike.registration_cmd, sn, staking_requirement)
+                    for sn in self.sns[0:5]]
+        for cmd in reg_cmds:
+            self.mike.submit_registration(cmd.result())
             vprint(".", end="", flush=True, timestamp=False)
         vprint(timestamp=False)
         if len(self.sns) > 5:
@@ -238,8 +262,10 @@ class SNNetwork:
             self.mike.transfer(self.alice, coins(150))
             self.mike.transfer(self.bob, coins(150))
             vprint("Submitting more service node registrations: ", end="", flush=True)
-            for sn in self.sns[5:-1]:
-                self.mike.register_sn(sn, self.sns[0].get_staking_requirement())
+            reg_cmds = [thread_pool.submit(self.mike.registration_cmd, sn, staking_requirement)
+                        for sn in self.sns[5:-1]]
+            for cmd in reg_cmds:
+                self.mike.submit_registration(cmd.result())
                 vprint(".", end="", flush=True, timestamp=False)
             vprint(timestamp=False)
             vprint("Done.")
@@ -248,19 +274,21 @@ class SNNetwork:
 
         vprint("Mining 30 blocks to height 149 (registrations + blink quorum lag) and waiting for nodes to sync")
         self.sync_nodes(self.mine(29), timeout=120)
-        for wallet in self.extrawallets:
-            self.mike.transfer(wallet, coins(11))
+        self.mike.transfer_multiple([(wallet, coins(11)) for wallet in self.extrawallets])
         self.sync_nodes(self.mine(1), timeout=120) # Height 149
 
         self.print_wallet_balances()
 
         # Register the last SN through Bobs wallet (Has not done any others)
         # and also get 9 other wallets to contribute the rest of the node with a 10% operator fee
-        self.bob.register_sn_for_contributions(sn=self.sns[-1], cut=10, amount=coins(28), staking_requirement=self.sns[0].get_staking_requirement())
+        self.bob.register_sn_for_contributions(sn=self.sns[-1], cut=10, amount=coins(28), staking_requirement=staking_requirement)
         self.sync_nodes(self.mine(21), timeout=120) # Height 170
         self.print_wallet_balances()
+        # Contributions come from distinct wallets, so they can all be submitted in parallel
         for wallet in self.extrawallets:
-            wallet.contribute_to_sn(self.sns[-1], coins(8))
+            futures.append(thread_pool.submit(wallet.contribute_to_sn, self.sns[-1], coins(8)))
+        concurrent.futures.wait(futures)
+        futures.clear()
 
         vprint("Sending fake lokinet/ss pings")
         for sn in self.sns:
@@ -270,9 +298,10 @@ class SNNetwork:
         for sn in self.sns:
             sn.send_uptime_proof()
 
+        # Proofs propagate through the gossip network, so one SN's view eventually includes every
+        # other SN; polling a single node avoids re-fetching the full list once per SN.
         vprint("Waiting for proofs to propagate:", flush=True)
-        for sn in self.sns:
-            wait_for(lambda: all_service_nodes_proofed(sn), timeout=120)
+        wait_for(lambda: all_service_nodes_proofed(self.sns[0]), timeout=120)
         vprint(timestamp=False)
 
         self.sync_nodes(self.mine(1), timeout=120) # Height 171
@@ -287,9 +316,13 @@ class SNNetwork:
         # Note all SNs up to this point (HF < feature::ETH_BLS) had a 100 OXEN staking requirement
         oxen_staking_requirement     = self.sns[0].get_staking_requirement()
         contract_staking_requirement = self.sn_contract.stakingRequirement()
+        # The oxen->SENT scaling ratio is invariant across contributors; compute it once instead of
+        # redoing the division for every entry.
+        stake_scale         = contract_staking_requirement / oxen_staking_requirement
         seed_node_list      = []
         for sn in self.sns:
-            node      = ContractSeedServiceNode(sn.get_service_keys().bls_pubkey)
+            keys      = sn.get_service_keys()
+            node      = ContractSeedServiceNode(keys.bls_pubkey)
             assert node.pubkey is not None
             contributors = sn.sn_status()["service_node_state"]["contributors"]
             total_staked = 0
@@ -299,7 +332,7 @@ class SNNetwork:
                 contributor.addr         = hardhat_account # Default to the hardhat account
 
                 # Use the oxen amount proportionally as the SENT amount
-                contributor.stakedAmount = int((entry["amount"] / oxen_staking_requirement * contract_staking_requirement))
+                contributor.stakedAmount = int(entry["amount"] * stake_scale)
                 total_staked += contributor.stakedAmount
 
                 node.contributors.append(contributor)
@@ -325,9 +358,7 @@ class SNNetwork:
         self.sn_contract.addBLSPublicKey(ethereum_add_bls_args)
 
         # Advance the Arbitrum blockchain so that the SN registration is observed in oxen
-        ethereum.evm_mine(self.sn_contract.web3)
-        ethereum.evm_mine(self.sn_contract.web3)
-        ethereum.evm_mine(self.sn_contract.web3)
+        ethereum.anvil_mine(self.sn_contract.web3, 3)
 
         # NOTE: Log all the SNs in the contract ####################################################
         contract_sn_id_it = 0
@@ -347,15 +378,11 @@ class SNNetwork:
         # Sleep and let pulse quorum do work
         vprint(f"Sleeping now, awaiting pulse quorum to generate blocks, blockchain height is {self.ethsns[0].height()}");
 
-        total_sleep_time = 0
-        sleep_time       = 8
-        target_height = self.ethsns[0].height() + 2;
-
-        while self.ethsns[0].height() < target_height:
-            total_sleep_time += sleep_time
-            time.sleep(sleep_time)
+        pulse_begin_time = time.perf_counter()
+        target_height    = self.ethsns[0].height() + 2;
+        wait_for(lambda: self.ethsns[0].height() >= target_height, timeout=120)
 
-        vprint(f"Waking up after sleeping for {total_sleep_time}s, blockchain height is {self.ethsns[0].height()}");
+        vprint(f"Waking up after sleeping for {time.perf_counter() - pulse_begin_time:.2f}s, blockchain height is {self.ethsns[0].height()}");
 
         # NOTE: BLS rewards claim ##################################################################
         # Claim rewards for Address
@@ -404,44 +431,13 @@ class SNNetwork:
                hardhat_account)
         vprint("Balance for '{}' after claim {}".format(hardhat_account, self.sn_contract.erc20balance(hardhat_account)))
 
-        # Initiate Removal of BLS Key ##############################################################
-        # sn_to_remove_index       = random.randint(0, len(self.sns) - 1)
-        # sn_to_remove_bls_pubkey  = self.sns[sn_to_remove_index].get_service_keys().bls_pubkey
-        # sn_to_remove_contract_id = self.sn_contract.getServiceNodeID(sn_to_remove_bls_pubkey)
-
-        # vprint("Randomly chose to remove SN {} with BLS key {}, submitting request".format(sn_to_remove_contract_id, sn_to_remove_bls_pubkey))
-        # self.sn_contract.initiateRemoveBLSPublicKey(sn_to_remove_contract_id)
-
-        # days_30_in_seconds = 60 * 60 * 24 * 30
-        # ethereum.evm_increaseTime(self.sn_contract.web3, days_30_in_seconds)
-        # ethereum.evm_mine(self.sn_contract.web3)
-
-        # Exit Node ################################################################################
-        # exit_request = self.ethsns[0].get_exit_request(sn_to_remove_bls_pubkey)
-        # vprint("Exit request aggregated: {}".format(exit_request))
-        # self.sn_contract.removeBLSPublicKeyWithSignature(exit_request["result"]["bls_pubkey"],
-        #                                                  exit_request["result"]["timestamp"],
-        #                                                  exit_request["result"]["signature"],
-        #                                                  exit_request["result"]["non_signer_indices"])
-
-        # Liquidate Node ###########################################################################
-        # exit = self.ethsns[0].get_liquidation_request(ethereum_add_bls_args["bls_pubkey"])
-        # result = self.sn_contract.liquidateBLSPublicKeyWithSignature(
-                # exit["result"]["bls_key"],
-                # exit["result"]["signature"],
-                # exit["result"]["non_signers_bls_pubkeys"])
-        # vprint(result)
-        # vprint("Submitted transaction to liquidate service node : {}".format(ethereum_add_bls_args["bls_pubkey"]))
-        # vprint("liquidated node: number of service nodes in contract {}".format(self.sn_contract.numberServiceNodes()))
-
         elapsed_time = time.perf_counter() - begin_time
         vprint("Local Devnet SN network setup complete in {}s!".format(elapsed_time))
         vprint("Communicate with daemon on ip: {} port: {}".format(self.sns[0].listen_ip,self.sns[0].rpc_port))
 
     def refresh_wallets(self, *, extra=[]):
         vprint("Refreshing wallets")
-        for w in self.wallets + extra:
-            w.refresh()
+        concurrent.futures.wait([self.thread_pool.submit(w.refresh) for w in self.wallets + extra])
         vprint("All wallets refreshed")
 
 
@@ -459,11 +455,15 @@ class SNNetwork:
         start_height = node.height()
         end_height = start_height + blocks
         node.mine_blocks(blocks, wallet)
-        while node.rpc("/mining_status").json()["active"]:
-            height = node.height()
-            vprint("Mined {}/{}".format(height, end_height))
-            time.sleep(0.05 if height >= end_height else 0.25)
+        # Watch the height directly instead of also polling /mining_status: one RPC per tick
+        # rather than two, and a short initial backoff so quick mining jobs aren't over-slept.
+        backoff = 0.02
         height = node.height()
+        while height < end_height:
+            vprint("Mined {}/{}".format(height, end_height))
+            time.sleep(backoff)
+            backoff = min(backoff * 1.5, 0.25)
+            height = node.height()
         vprint("Mined {}/{}".format(height, end_height))
 
         if sync:
@@ -476,7 +476,7 @@ class SNNetwork:
     def sync_nodes(self, height=None, *, extra=[], timeout=10):
         """Waits for all nodes to reach the given height, typically invoked after mine()"""
         nodes = self.all_nodes + extra
-        heights = [x.height() for x in nodes]
+        heights = list(self.thread_pool.map(lambda x: x.height(), nodes))
         if height is None:
             height = max(heights)
         if min(heights) >= height:
@@ -484,21 +484,22 @@ class SNNetwork:
             return
         vprint("Waiting for all nodes to sync to height {}".format(height))
         last = None
+        behind = [x for x, h in zip(nodes, heights) if h < height]
         expiry = time.time() + timeout
-        while nodes and time.time() < expiry:
-            if heights[-1] < height:
-                heights[-1] = nodes[-1].height()
-            if heights[-1] >= height:
-                heights.pop()
-                nodes.pop()
-                last = None
-                continue
-            if heights[-1] != last:
-                vprint("waiting for {} [{} -> {}]".format(nodes[-1].name, heights[-1], height))
-                last = heights[-1]
+        while behind:
+            # Poll every still-behind node concurrently each tick so a tick costs the slowest
+            # single RPC rather than waiting on the nodes one at a time.
+            heights = list(self.thread_pool.map(lambda x: x.height(), behind))
+            behind  = [x for x, h in zip(behind, heights) if h < height]
+            if not behind:
+                break
+            if time.time() >= expiry:
+                raise RuntimeError("Timed out waiting for node syncing")
+            status = (len(behind), min(heights))
+            if status != last:
+                vprint("waiting for {} node(s) [{} -> {}]".format(len(behind), min(heights), height))
+                last = status
             time.sleep(0.1)
-        if nodes:
-            raise RuntimeError("Timed out waiting for node syncing")
         vprint("All nodes synced to height {}".format(height))
 
 
@@ -514,13 +515,13 @@ class SNNetwork:
         global verbose
         if not verbose:
             return
+        # The refresh dominates the cost and is independent per wallet, so refresh everything in
+        # parallel and then do the (cheap) balance fetches serially for display.
+        wallets = self.wallets + self.extrawallets
+        concurrent.futures.wait([self.thread_pool.submit(w.refresh) for w in wallets])
         vprint("Balances:")
-        for w in self.wallets:
-            b = w.balances(refresh=True)
-            vprint("    {:5s}: {:.9f} (total) with {:.9f} (unlocked)".format(
-                w.name, b[0] * 1e-9, b[1] * 1e-9))
-        for w in self.extrawallets:
-            b = w.balances(refresh=True)
+        for w in wallets:
+            b = w.balances()
             vprint("    {:5s}: {:.9f} (total) with {:.9f} (unlocked)".format(
                 w.name, b[0] * 1e-9, b[1] * 1e-9))
 
@@ -532,6 +533,8 @@ class SNNetwork:
             w.terminate()
         if self.anvil is not None:
             self.anvil.terminate()
+        if hasattr(self, 'thread_pool'):
+            self.thread_pool.shutdown(wait=False)
 
 snn = None
 